@@ -0,0 +1,598 @@
+"""
+Agent基类模块
+封装所有AI代理共用的配置加载、HTTP会话、请求头/请求体模板、gzip压缩和响应解析逻辑，
+各具体Agent只需提供配置键名和prompt字典
+"""
+
+import asyncio
+import functools
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+import os
+from typing import Optional, Dict, Any, Tuple, Union, List, Mapping
+from Message.InputMsg import InputMessage
+from Utiles.ConfigLoader import load_config
+from Utiles import JsonCodec
+from Utiles.JsonClean import clean_json_from_markdown
+from Utiles.ImageEncode import encode_image_to_data_url, jpeg_bytes_to_data_url, load_jpeg_bytes
+from Utiles.ImagePreprocessor import ImagePreprocessor
+
+# 请求体小于该字节数时不压缩（无图片的请求压缩收益很小）
+GZIP_MIN_SIZE = 4096
+
+# 并发执行多个Agent时同时进行的请求数上限，避免触发服务端的速率限制
+DEFAULT_MAX_CONCURRENCY = 16
+
+# 开启response_cache时内存中最多缓存的回答条数
+RESPONSE_CACHE_SIZE = 128
+
+# 回答缓存：请求体摘要 -> 回答文本，所有开启response_cache的Agent共用（按最近使用淘汰）
+_response_cache: "OrderedDict[str, str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_session(base_url: str) -> requests.Session:
+    """
+    获取指定服务地址共用的HTTP会话，同一服务的所有Agent复用同一个连接池
+    
+    Args:
+        base_url: API服务地址
+    
+    Returns:
+        HTTP会话
+    """
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_MAX_CONCURRENCY))
+    return session
+
+
+class BaseAgent:
+    """
+    AI代理客户端基类（纯文本请求）
+    
+    子类需要设置:
+        CONFIG_KEY: 配置文件中对应的节名
+        PROMPT: prompt字典
+    """
+    
+    CONFIG_KEY: str = ""
+    PROMPT: Mapping[str, Any] = {}
+    # 由PROMPT预编译得到的句子模板，定义子类时自动生成
+    PROMPT_TEMPLATE: str = ""
+    
+    # 配置中未指定时使用的默认请求参数
+    DEFAULT_MAX_TOKENS = 2000   # 限制返回长度
+    DEFAULT_TEMPERATURE = 0.7   # 控制回答的创造性
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.PROMPT:
+            cls.PROMPT_TEMPLATE = ", ".join(f"{key}: {{{key}}}" for key in cls.PROMPT)
+    
+    def __init__(self, config_path: str = "Config/Config.yaml", session: Optional[requests.Session] = None):
+        """
+        初始化AI代理
+        
+        Args:
+            config_path: 配置文件路径
+            session: 共用的HTTP会话，为None时使用同一服务地址共用的默认会话
+        """
+        self.config = self._load_config(config_path)
+        agent_config = self.config[self.CONFIG_KEY]
+        self.api_key = agent_config['api_key']
+        self.base_url = agent_config['base_url']
+        self.model = agent_config['model']
+        
+        # 同一服务地址的Agent共用HTTP会话（keep-alive），避免每个Agent各自建立TLS连接；
+        # 也可由调用方传入会话，让访问不同服务地址的Agent共用同一个连接池
+        self._session = session if session is not None else _shared_session(self.base_url)
+        
+        # 预先构建请求头，避免每次请求重复构建
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            **self._site_headers()
+        }
+        
+        # 可选：gzip压缩较大的请求体（需要服务端支持Content-Encoding: gzip）
+        self._gzip_request = agent_config.get('gzip_request', False)
+        
+        # 可选：缓存回答，相同的请求（同一模型、prompt和图片内容）直接返回上次的回答
+        self._response_cache = agent_config.get('response_cache', False)
+        
+        # 预先构建请求体模板，每次请求只填入消息内容
+        self._body_template = {
+            "model": self.model,
+            "max_tokens": agent_config.get('max_tokens', self.DEFAULT_MAX_TOKENS),
+            "temperature": agent_config.get('temperature', self.DEFAULT_TEMPERATURE)
+        }
+        
+        # 初始化prompt实例并设置全局变量的内容
+        self.inputMessage = InputMessage()
+        self.inputMessage.add_dict(self.PROMPT)
+        self.inputMessage.register_template(self.PROMPT_TEMPLATE, list(self.PROMPT))
+        
+        # 验证API密钥
+        if self.api_key == "YOUR_OPENROUTER_API_KEY":
+            raise ValueError("请在Config/Config.yaml中设置正确的OpenRouter API密钥")
+    
+    def _load_config(self, config_path: str) -> Dict[str, Any]:
+        """加载配置文件"""
+        return load_config(config_path)
+    
+    def _site_headers(self) -> Dict[str, str]:
+        """根据配置生成可选的网站信息请求头"""
+        site = self.config.get('site') or {}
+        headers = {}
+        if 'url' in site:
+            headers["HTTP-Referer"] = site['url']
+        if 'name' in site:
+            headers["X-Title"] = site['name']
+        return headers
+    
+    def _prepare_payload(self, data: Dict[str, Any]) -> Tuple[bytes, Dict[str, str]]:
+        """
+        序列化请求体，开启gzip_request时压缩较大的请求体
+        
+        Args:
+            data: 请求数据
+        
+        Returns:
+            (请求体字节数据, 请求头)
+        """
+        payload = JsonCodec.dumps_bytes(data)
+        if self._gzip_request and len(payload) >= GZIP_MIN_SIZE:
+            return gzip.compress(payload, compresslevel=1), {**self._headers, "Content-Encoding": "gzip"}
+        return payload, self._headers
+    
+    def _post(self, data: Dict[str, Any]) -> requests.Response:
+        """
+        以JSON形式发送请求
+        
+        Args:
+            data: 请求数据
+        
+        Returns:
+            响应对象
+        """
+        payload, headers = self._prepare_payload(data)
+        return self._session.post(
+            self.base_url,
+            headers=headers,
+            data=payload,
+            stream=True,  # 分块读取响应体
+            timeout=60  # 60秒超时
+        )
+    
+    def _parse_answer(self, response: requests.Response) -> str:
+        """
+        检查响应状态并提取模型的回答文本
+        
+        无论成功与否都会关闭响应（stream=True时不关闭则连接不会归还连接池）
+        
+        Args:
+            response: 响应对象
+        
+        Returns:
+            模型的回答文本
+        """
+        with response:
+            # 检查响应状态；出错时先读取响应体，关闭后调用方仍可通过e.response.text输出错误信息
+            if not response.ok:
+                response.content
+            response.raise_for_status()
+            
+            # 解析响应
+            result = JsonCodec.loads_response(response)
+        
+        if 'choices' in result and len(result['choices']) > 0:
+            return result['choices'][0]['message']['content']
+        else:
+            raise Exception("API返回格式异常：未找到回答内容")
+    
+    def _send(self, data: Dict[str, Any]) -> str:
+        """
+        发送请求并返回模型的回答文本
+        
+        开启response_cache时，以服务地址和请求体（图片已编码在其中）的摘要为键缓存回答
+        
+        Args:
+            data: 请求数据
+        
+        Returns:
+            模型的回答文本
+        """
+        if not self._response_cache:
+            return self._parse_answer(self._post(data))
+        
+        digest = hashlib.blake2b(self.base_url.encode(), digest_size=16)
+        digest.update(JsonCodec.dumps_bytes(data))
+        key = digest.hexdigest()
+        with _response_cache_lock:
+            answer = _response_cache.get(key)
+            if answer is not None:
+                _response_cache.move_to_end(key)
+                return answer
+        
+        answer = self._parse_answer(self._post(data))
+        with _response_cache_lock:
+            _response_cache[key] = answer
+            if len(_response_cache) > RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+        return answer
+    
+    def _build_data(self, content: Union[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        根据消息内容构建请求数据（浅拷贝模板，避免并发请求之间共享可变状态）
+        
+        Args:
+            content: 用户消息内容
+        
+        Returns:
+            请求数据
+        """
+        return {
+            **self._body_template,
+            "messages": [{"role": "user", "content": content}]
+        }
+    
+    def run(self) -> str:
+        """
+        使用InputMessage中的prompt发送请求
+        
+        Returns:
+            模型的回答文本
+        """
+        question = self.inputMessage.to_sentence()
+        print(f"🔍 发送问题: {question}")
+        
+        return self._send(self._build_data(question))
+    
+    async def run_async(self) -> str:
+        """
+        run的异步版本，在线程池中执行请求，便于与其他Agent的请求通过asyncio.gather并发执行
+        
+        注意：同一Agent实例不应被并发调用
+        
+        Returns:
+            模型的回答文本
+        """
+        return await asyncio.to_thread(self.run)
+
+
+class ImageAgent(BaseAgent):
+    """图像理解AI代理客户端基类"""
+    
+    def __init__(self, config_path: str = "Config/Config.yaml", session: Optional[requests.Session] = None):
+        """
+        初始化图像理解AI代理
+        
+        Args:
+            config_path: 配置文件路径
+            session: 共用的HTTP会话，为None时使用同一服务地址共用的默认会话
+        """
+        super().__init__(config_path, session)
+        
+        # 可选：后端支持multipart/form-data上传图片时的请求地址
+        self._multipart_url = self.config[self.CONFIG_KEY].get('multipart_url')
+    
+    def _post_multipart(self, data: Dict[str, Any], image_path: str) -> requests.Response:
+        """
+        以multipart/form-data形式上传JPEG原始字节和JSON请求体
+        
+        Args:
+            data: 请求数据（消息中不包含图片）
+            image_path: 本地图片路径
+        
+        Returns:
+            响应对象
+        """
+        # Content-Type由requests根据multipart边界自动生成
+        headers = {k: v for k, v in self._headers.items() if k != "Content-Type"}
+        return self._session.post(
+            self._multipart_url,
+            headers=headers,
+            files={"image": (os.path.basename(image_path), self._load_image_bytes(image_path), "image/jpeg")},
+            data={"json": JsonCodec.dumps(data)},
+            stream=True,  # 分块读取响应体
+            timeout=60  # 60秒超时
+        )
+    
+    def _load_image_bytes(self, image_path: str) -> bytes:
+        """读取本地图片的JPEG字节数据（用于multipart上传）"""
+        return load_jpeg_bytes(image_path)
+    
+    def _encode_image_to_base64(self, image_path: str) -> str:
+        """
+        将本地图片转换为base64格式，非JPEG图片会先重新压缩为JPEG
+        
+        Args:
+            image_path: 图片文件路径
+        
+        Returns:
+            base64编码的图片数据URL
+        """
+        # 编码结果按文件缓存，多个Agent处理同一张图片时只编码一次
+        return encode_image_to_data_url(image_path)
+    
+    def _send_with_image(self, data: Dict[str, Any], image_path: Optional[str]) -> str:
+        """
+        发送请求并返回模型的回答文本
+        
+        Args:
+            data: 请求数据
+            image_path: 需要以multipart上传的本地图片路径，为None时以JSON发送
+        
+        Returns:
+            模型的回答文本
+        """
+        if image_path is None:
+            return self._send(data)
+        return self._parse_answer(self._post_multipart(data, image_path))
+    
+    def set_image(self, image_path: str) -> None:
+        """
+        设置要处理的图片路径
+        
+        Args:
+            image_path: 图片文件路径（支持本地路径或URL）
+        """
+        if not image_path:
+            raise ValueError("图片路径不能为空")
+        
+        # 验证本地文件是否存在（一次stat同时检查是否为空文件）
+        if not image_path.startswith(('http://', 'https://')):
+            try:
+                file_size = os.stat(image_path).st_size
+            except FileNotFoundError:
+                raise FileNotFoundError(f"图片文件 {image_path} 未找到")
+            if file_size == 0:
+                raise ValueError(f"图片文件 {image_path} 为空")
+        
+        self.inputMessage.set_image(image_path)
+    
+    def run(self) -> str:
+        """
+        对已设置的图片发送请求
+        
+        Returns:
+            模型的回答文本
+        """
+        # 检查是否已设置图片
+        if not self.inputMessage.image:
+            raise ValueError("请先使用set_image()方法设置图片路径")
+        
+        # question从prompt实例中获取
+        question = self.inputMessage.to_sentence()
+        image_path = self.inputMessage.image
+        print(f"🔍 发送问题: {question}")
+        
+        # 构建消息
+        message_content = [
+            {
+                "type": "text",
+                "text": question
+            }
+        ]
+        
+        # 后端支持multipart上传时，本地图片以JPEG原始字节单独上传，省去base64编码
+        use_multipart = bool(self._multipart_url) and not image_path.startswith(('http://', 'https://'))
+        if not use_multipart:
+            # 准备图片URL（支持本地文件和网络URL）
+            if image_path.startswith(('http://', 'https://')):
+                image_url = image_path
+            else:
+                # 本地文件转换为base64
+                image_url = self._encode_image_to_base64(image_path)
+            message_content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": image_url
+                }
+            })
+        
+        # 发送请求
+        return self._send_with_image(self._build_data(message_content), image_path if use_multipart else None)
+    
+    def ask_about_image(self) -> str:
+        """
+        对已设置的图片进行提问
+        
+        Returns:
+            模型的回答文本
+        """
+        return self.run()
+    
+    async def ask_about_image_async(self) -> str:
+        """
+        ask_about_image的异步版本，在线程池中执行请求，便于与其他Agent的请求通过asyncio.gather并发执行
+        
+        注意：同一Agent实例不应被并发调用
+        
+        Returns:
+            模型的回答文本
+        """
+        return await self.run_async()
+
+
+class BBoxImageAgent(ImageAgent):
+    """
+    返回边界框坐标的图像理解AI代理客户端基类
+    
+    本地图片先经过ImagePreprocessor缩放压缩，返回的坐标可自动转换回原图
+    """
+    
+    # 提示信息中使用的结果名称，如"分割结果"、"检测结果"
+    RESULT_NAME: str = "结果"
+    
+    def __init__(self, config_path: str = "Config/Config.yaml", session: Optional[requests.Session] = None):
+        """
+        初始化AI代理
+        
+        Args:
+            config_path: 配置文件路径
+            session: 共用的HTTP会话，为None时使用同一服务地址共用的默认会话
+        """
+        super().__init__(config_path, session)
+        
+        # 初始化图像预处理器
+        self.image_preprocessor = ImagePreprocessor()
+        self.scale_info = None  # 保存图像缩放信息
+    
+    def _load_image_bytes(self, image_path: str) -> bytes:
+        """
+        使用ImagePreprocessor预处理本地图片并返回JPEG字节数据
+        
+        Args:
+            image_path: 图片文件路径
+        
+        Returns:
+            压缩后的JPEG字节数据
+        """
+        # 只需要压缩数据和缩放信息，结果按文件缓存
+        compressed_data, scale_info = self.image_preprocessor.preprocess_image_bytes(image_path)
+        
+        # 保存缩放信息用于后续坐标转换
+        self.scale_info = scale_info
+        return compressed_data
+    
+    def _encode_image_to_base64(self, image_path: str) -> str:
+        """
+        将本地图片转换为base64格式，使用ImagePreprocessor进行预处理
+        
+        Args:
+            image_path: 图片文件路径
+        
+        Returns:
+            base64编码的图片数据URL
+        """
+        try:
+            # 使用ImagePreprocessor预处理图像（结果按文件缓存）
+            compressed_data = self._load_image_bytes(image_path)
+            
+            # 将压缩后的数据转换为base64（同一份预处理结果只编码一次）
+            return jpeg_bytes_to_data_url(compressed_data)
+        
+        except FileNotFoundError:
+            raise FileNotFoundError(f"图片文件 {image_path} 未找到")
+        except Exception as e:
+            raise Exception(f"图片编码失败: {e}")
+    
+    def _send_with_image(self, data: Dict[str, Any], image_path: Optional[str]) -> str:
+        """发送请求，并将常见的网络和响应错误转换为可读的错误信息"""
+        try:
+            return super()._send_with_image(data, image_path)
+        except requests.exceptions.Timeout:
+            raise Exception("请求超时，请检查网络连接或稍后重试")
+        except requests.exceptions.HTTPError as e:
+            response = e.response
+            if response.status_code == 401:
+                raise Exception("API密钥无效，请检查Config/Config.yaml中的api_key")
+            elif response.status_code == 429:
+                raise Exception("请求频率过高，请稍后重试")
+            else:
+                raise Exception(f"HTTP错误 {response.status_code}: {response.text}")
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"网络请求失败: {e}")
+        except JsonCodec.JSONDecodeError:
+            raise Exception("API返回数据格式错误")
+        except Exception as e:
+            raise Exception(f"未知错误: {e}")
+    
+    def convert_coordinates_to_original(self, results: list) -> list:
+        """
+        将结果中的坐标转换回原图坐标
+        
+        Args:
+            results: 结果列表，每个元素包含bbox_2d和label
+        
+        Returns:
+            转换后的结果列表
+        """
+        if self.scale_info is None:
+            print("⚠️ 警告: 缺少缩放信息，无法转换坐标到原图")
+            return results
+        
+        # 一次性批量转换所有边界框，再按原顺序放回结果中
+        indices = [i for i, result in enumerate(results)
+                   if isinstance(result, dict) and 'bbox_2d' in result]
+        original_bboxes = self.image_preprocessor.convert_coordinates_list_to_original(
+            [results[i]['bbox_2d'] for i in indices]
+        )
+        
+        converted_results = list(results)
+        for i, original_bbox in zip(indices, original_bboxes):
+            # 创建新的结果字典
+            converted_result = converted_results[i].copy()
+            converted_result['bbox_2d'] = original_bbox
+            converted_results[i] = converted_result
+        
+        return converted_results
+    
+    def ask_about_image_with_coordinate_conversion(self) -> str:
+        """
+        对已设置的图片进行提问，并自动转换坐标到原图
+        
+        Returns:
+            模型的回答文本（坐标已转换到原图）
+        """
+        # 获取原始结果
+        raw_result = self.ask_about_image()
+        
+        # 尝试解析并转换坐标
+        try:
+            # 清理markdown格式
+            cleaned_result = clean_json_from_markdown(raw_result)
+            # 尝试解析JSON格式的结果
+            results = JsonCodec.loads(cleaned_result)
+            
+            if isinstance(results, list):
+                # 转换坐标到原图
+                converted_results = self.convert_coordinates_to_original(results)
+                return JsonCodec.dumps(converted_results)
+            else:
+                print(f"⚠️ 警告: {self.RESULT_NAME}格式不是预期的列表格式")
+                return raw_result
+        
+        except JsonCodec.JSONDecodeError:
+            print(f"⚠️ 警告: {self.RESULT_NAME}不是有效的JSON格式，返回原始结果")
+            return raw_result
+        except Exception as e:
+            print(f"⚠️ 警告: 坐标转换时发生错误: {e}")
+            return raw_result
+    
+    async def ask_about_image_with_coordinate_conversion_async(self) -> str:
+        """
+        ask_about_image_with_coordinate_conversion的异步版本，在线程池中执行请求，便于与其他Agent的请求通过asyncio.gather并发执行
+        
+        注意：同一Agent实例不应被并发调用
+        
+        Returns:
+            模型的回答文本（坐标已转换到原图）
+        """
+        return await asyncio.to_thread(self.ask_about_image_with_coordinate_conversion)
+
+
+async def run_agents_async(agents: List[BaseAgent], max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[str]:
+    """
+    并发执行多个Agent的请求，同时进行的请求数不超过max_concurrency
+    
+    Args:
+        agents: Agent列表，每个Agent应已设置好输入消息（和图片），同一实例不应在列表中重复出现
+        max_concurrency: 同时进行的请求数上限
+        
+    Returns:
+        各Agent的回答文本，顺序与输入一致
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    
+    async def run_one(agent: BaseAgent) -> str:
+        async with semaphore:
+            return await agent.run_async()
+    
+    return await asyncio.gather(*(run_one(agent) for agent in agents))
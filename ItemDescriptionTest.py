@@ -10,47 +10,9 @@ GraspMind 物品描述测试程序
 """
 
 import os
-import json
 from Agents.ItemDescriptionAgent import ItemDescriptionAgent
-from Utiles.ResultSaver import get_next_run_number, extract_and_save_json
-
-
-def clean_json_from_markdown(text: str) -> str:
-    """从markdown代码块中提取JSON内容"""
-    text = text.strip()
-    
-    # 移除markdown代码块标记
-    if text.startswith('```json'):
-        lines = text.split('\n')
-        start_found = False
-        json_lines = []
-        
-        for line in lines:
-            if line.strip() == '```json':
-                start_found = True
-                continue
-            elif line.strip() == '```' and start_found:
-                break
-            elif start_found:
-                json_lines.append(line)
-        
-        text = '\n'.join(json_lines)
-    elif text.startswith('```') and text.endswith('```'):
-        text = text[3:-3].strip()
-    
-    return text
-
-
-def sentence_to_dict(sentence: str):
-    """本地实现的JSON解析函数"""
-    if not isinstance(sentence, str):
-        return {}
-    
-    # 清理可能的markdown格式
-    cleaned_sentence = clean_json_from_markdown(sentence)
-    # 解析JSON
-    result = json.loads(cleaned_sentence)
-    return result
+from Utiles.ResultSaver import ResultSaver, ResultBundle, get_next_run_number
+from Utiles.JsonExtract import parse_llm_json
 
 
 def simple_test():
@@ -79,7 +41,7 @@ def simple_test():
     # 设置图片
     agent.set_image(image_path)
     
-    print(f"📋 配置内容: {agent.inputMessage.text}")
+    print(f"📋 配置内容: {[dict(d) for d in agent.inputMessage.text]}")
     
     print("\n🤖 正在处理，请稍候...")
     
@@ -95,56 +57,54 @@ def simple_test():
     print(answer)
     print("-" * 50)
     
-    # 创建运行目录并保存原始回答
-    run_dir = f"Output/{run_number:03d}Run"
-    os.makedirs(run_dir, exist_ok=True)
-    
-    # 总是保存原始回答
-    with open(f"{run_dir}/raw_response.txt", "w", encoding="utf-8") as f:
-        f.write(answer)
-    print(f"💾 原始回答保存到: {run_dir}/raw_response.txt")
-    
-    # 解析AI回答为字典格式
-    print("\n🔄 尝试解析AI回答为字典格式...")
-    json_file = None
-    
-    result_dict = sentence_to_dict(answer)
-    print(f"🔍 解析结果: {result_dict}")
-    if result_dict:
-        print(f"✅ 成功解析为字典: {result_dict}")
+    # 将本次运行的所有输出写入同一个结果包
+    with ResultBundle(run_number) as bundle:
+        # 总是保存原始回答
+        raw_file = bundle.write("raw_response.txt", answer)
+        print(f"💾 原始回答保存到: {raw_file}")
         
-        # 保存解析后的字典
-        json_file = f"{run_dir}/description_results.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(result_dict, f, ensure_ascii=False, indent=2)
-        print(f"💾 字典结果保存到: {json_file}")
+        # 解析AI回答为字典格式
+        print("\n🔄 尝试解析AI回答为字典格式...")
+        json_file = None
         
-    else:
-        print("⚠️ 解析返回空字典，尝试原来的方法")
-        # 如果解析失败，尝试原来的方法
-        json_file = extract_and_save_json(answer, run_number)
-    
-    # 保存物品描述汇总
-    if json_file:
-        print(f"📊 JSON文件: {json_file}")
+        result_dict = parse_llm_json(answer)
+        print(f"🔍 解析结果: {result_dict}")
+        if result_dict:
+            print(f"✅ 成功解析为字典: {result_dict}")
+            
+            # 保存解析后的字典
+            json_file = bundle.write_json("description_results.json", result_dict)
+            print(f"💾 字典结果保存到: {json_file}")
+            
+        else:
+            print("⚠️ 解析返回空字典，尝试原来的方法")
+            # 如果解析失败，尝试原来的方法
+            fallback_result = ResultSaver.parse_fenced_json(answer)
+            if fallback_result is not None:
+                json_file = bundle.write_json("detection_results.json", fallback_result)
         
-        # 创建物品描述汇总
-        print("\n📋 生成物品描述汇总...")
-        summary_file = f"{run_dir}/description_summary.txt"
-        with open(summary_file, "w", encoding="utf-8") as f:
-            f.write("物品描述分析汇总\n")
-            f.write("=" * 30 + "\n\n")
-            f.write(f"用户需求: {agent.inputMessage.text[0].get('user_requirements', 'N/A')}\n")
-            f.write(f"输出格式要求: {agent.inputMessage.text[0].get('output_format', 'N/A')}\n")
-            f.write(f"约束条件: {agent.inputMessage.text[0].get('Constraint', 'N/A')}\n")
-            f.write(f"当前物品: {agent.inputMessage.text[1].get('Current_Item', 'N/A')}\n")
-            f.write(f"图片路径: {image_path}\n\n")
-            f.write("AI分析结果:\n")
-            f.write("-" * 20 + "\n")
-            f.write(answer)
-        print(f"💾 物品描述汇总保存到: {summary_file}")
-    
-    print(f"\n🎉 处理完成！结果保存在: Output/{run_number:03d}Run/")
+        # 保存物品描述汇总
+        if json_file:
+            print(f"📊 JSON文件: {json_file}")
+            
+            # 创建物品描述汇总
+            print("\n📋 生成物品描述汇总...")
+            summary_text = "".join([
+                "物品描述分析汇总\n",
+                "=" * 30 + "\n\n",
+                f"用户需求: {agent.inputMessage.text[0].get('user_requirements', 'N/A')}\n",
+                f"输出格式要求: {agent.inputMessage.text[0].get('output_format', 'N/A')}\n",
+                f"约束条件: {agent.inputMessage.text[0].get('Constraint', 'N/A')}\n",
+                f"当前物品: {agent.inputMessage.text[1].get('Current_Item', 'N/A')}\n",
+                f"图片路径: {image_path}\n\n",
+                "AI分析结果:\n",
+                "-" * 20 + "\n",
+                answer,
+            ])
+            summary_file = bundle.write("description_summary.txt", summary_text)
+            print(f"💾 物品描述汇总保存到: {summary_file}")
+        
+    print(f"\n🎉 处理完成！结果保存在: {bundle.path}")
 
 
 def main():
@@ -1,11 +1,24 @@
-from typing import List, Dict, Any, Optional
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def _freeze(text_dict: Mapping) -> MappingProxyType:
+    """将字典转换为只读视图，已是只读视图时直接复用"""
+    if isinstance(text_dict, MappingProxyType):
+        return text_dict
+    return MappingProxyType(dict(text_dict))
 
 
 class InputMessage:
     """
-    简化的输入消息类，包含text字典列表和image路径
+    简化的输入消息类，包含text字典元组和image路径
+    
+    text中的字典以只读视图（MappingProxyType）保存，添加后不会再被意外修改
     """
     
+    __slots__ = ('text', 'image', '_sentence_cache', '_template', '_template_keys')
+    
     def __init__(self, text_messages: Optional[List[Dict[str, Any]]] = None, 
                  image_path: Optional[str] = None):
         """
@@ -15,23 +28,29 @@ class InputMessage:
             text_messages: 文本消息字典列表
             image_path: 图像路径，可以为None
         """
-        self.text = text_messages if text_messages is not None else []
+        self.text: Tuple[MappingProxyType, ...] = tuple(_freeze(d) for d in text_messages or ())
         self.image = image_path
+        # 默认参数下拼接结果的缓存，text变化时失效
+        self._sentence_cache: Optional[str] = None
+        # 预编译的句子模板及其对应的键顺序
+        self._template: Optional[str] = None
+        self._template_keys: Optional[Tuple[str, ...]] = None
     
     def add_dict(self, text_dict: Dict[str, Any]) -> None:
         """
-        在text列表中添加一个字典
+        在text中添加一个字典（保存为只读副本）
         
         Args:
             text_dict: 要添加的字典
         """
-        if not isinstance(text_dict, dict):
+        if not isinstance(text_dict, Mapping):
             raise TypeError("必须添加字典类型的数据")
-        self.text.append(text_dict)
+        self.text = self.text + (_freeze(text_dict),)
+        self._sentence_cache = None
     
     def remove_dict(self, index: int) -> bool:
         """
-        根据索引删除text列表中的字典
+        根据索引删除text中的字典
         
         Args:
             index: 要删除的字典索引
@@ -40,13 +59,32 @@ class InputMessage:
             删除成功返回True，否则返回False
         """
         if 0 <= index < len(self.text):
-            self.text.pop(index)
+            self.text = self.text[:index] + self.text[index + 1:]
+            self._sentence_cache = None
             return True
         return False
     
+    def register_template(self, template: str, keys: List[str]) -> None:
+        """
+        注册预编译的句子模板
+        
+        当text的第一个字典键顺序与keys一致时，to_sentence直接使用
+        template.format_map格式化该字典，跳过通用的拼接流程
+        
+        Args:
+            template: 句子模板，如"a: {a}, b: {b}"
+            keys: 模板对应的字典键顺序
+        """
+        self._template = template
+        self._template_keys = tuple(keys)
+        self._sentence_cache = None
+    
     def to_sentence(self, separator: str = "; ", key_value_connector: str = ": ") -> str:
         """
-        将text列表中的所有字典拼接成一句话
+        将text中的所有字典拼接成一句话
+        
+        默认参数下的结果会被缓存，通过add_dict/remove_dict修改时自动失效；
+        直接替换text属性后需调用invalidate_cache()
         
         Args:
             separator: 字典之间的分隔符，默认为"; "
@@ -55,18 +93,35 @@ class InputMessage:
         Returns:
             拼接后的字符串
         """
-        if not self.text:
-            return ""
+        use_cache = separator == "; " and key_value_connector == ": "
+        if use_cache and self._sentence_cache is not None:
+            return self._sentence_cache
+        
+        texts = self.text
+        head = None
+        if use_cache and self._template is not None and texts \
+                and tuple(texts[0]) == self._template_keys:
+            # 第一个字典与模板键顺序一致时直接格式化模板，其余字典（如追加的物品列表）再逐个拼接
+            head = self._template.format_map(texts[0])
+            texts = texts[1:]
+            if not texts:
+                self._sentence_cache = head
+                return head
         
-        sentences = []
-        for text_dict in self.text:
-            if isinstance(text_dict, dict):
-                dict_items = []
-                for key, value in text_dict.items():
-                    dict_items.append(f"{key}{key_value_connector}{value}")
-                sentences.append(", ".join(dict_items))
+        parts = (
+            ", ".join(f"{key}{key_value_connector}{value}" for key, value in text_dict.items())
+            for text_dict in texts
+            if isinstance(text_dict, Mapping)
+        )
+        sentence = separator.join(parts) if head is None else separator.join((head, *parts))
         
-        return separator.join(sentences)
+        if use_cache:
+            self._sentence_cache = sentence
+        return sentence
+    
+    def invalidate_cache(self) -> None:
+        """清除拼接结果缓存"""
+        self._sentence_cache = None
     
     def set_image(self, image_path: Optional[str]) -> None:
         """
@@ -78,7 +133,7 @@ class InputMessage:
         self.image = image_path
     
     def __len__(self) -> int:
-        """返回text列表的长度"""
+        """返回text中字典的数量"""
         return len(self.text)
     
     def __str__(self) -> str:
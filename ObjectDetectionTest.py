@@ -11,65 +11,33 @@ GraspMind 目标检测测试程序
 """
 
 import os
-import json
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List
 from Agents.ObjectDetectionAgent import ObjectDetectionAgent
 from Utiles.ResultSaver import get_next_run_number, extract_and_save_json
+from Utiles.JsonExtract import parse_llm_json
 from Utiles.Visualizer import quick_visualize
+from Utiles import JsonCodec
 
+# 结果写盘和可视化放到后台线程执行，不阻塞主流程的下一步
+_IO_POOL = ThreadPoolExecutor(max_workers=2)
 
-def clean_json_from_markdown(text: str) -> str:
-    """从markdown代码块中提取JSON内容"""
-    text = text.strip()
-    
-    # 移除markdown代码块标记
-    if text.startswith('```json'):
-        lines = text.split('\n')
-        start_found = False
-        json_lines = []
-        
-        for line in lines:
-            if line.strip() == '```json':
-                start_found = True
-                continue
-            elif line.strip() == '```' and start_found:
-                break
-            elif start_found:
-                json_lines.append(line)
-        
-        text = '\n'.join(json_lines)
-    elif text.startswith('```') and text.endswith('```'):
-        text = text[3:-3].strip()
-    
-    return text
 
+def _write_file(path: str, data: bytes):
+    """写入已编码的字节数据（在后台线程中执行）"""
+    Path(path).write_bytes(data)
 
-def sentence_to_dict(sentence: str):
-    """本地实现的JSON解析函数"""
-    try:
-        if not isinstance(sentence, str):
-            return {}
-        
-        if not sentence.strip():
-            return {}
-        
-        # 清理markdown格式
-        cleaned_text = clean_json_from_markdown(sentence)
-        
-        # 解析JSON
-        parsed_result = json.loads(cleaned_text)
-        
-        # 如果是列表，包装成字典格式
-        if isinstance(parsed_result, list):
-            return {"detection_results": parsed_result}
-        else:
-            return parsed_result
-            
-    except json.JSONDecodeError as e:
-        print(f"JSON格式解析失败: {e}")
-        return {}
-    except Exception as e:
-        print(f"字符串转换失败: {e}")
-        return {}
+
+def _save_and_visualize(json_file: str, json_data: bytes, image_path: str, run_dir: str):
+    """保存JSON并进行可视化（在后台线程中执行，可视化依赖JSON文件因此顺序执行）"""
+    _write_file(json_file, json_data)
+    
+    # 可视化
+    if quick_visualize(json_file, image_path):
+        basename = os.path.splitext(os.path.basename(image_path))[0]
+        print(f"🖼️ 标注图片: {run_dir}/{basename}_annotated.jpg")
+        print(f"📋 检测汇总: {run_dir}/detection_summary.txt")
 
 
 def test_detection():
@@ -95,40 +63,42 @@ def test_detection():
         print("-" * 40)
         print(result)
         print("-" * 40)
-          # 保存结果
-        save_result(result, image_path)
+          # 保存结果（后台写盘），程序结束前等待写盘完成
+        for future in save_result(result, image_path):
+            future.result()
     else:
         print("❌ 检测失败")
 
 
-def save_result(result: str, image_path: str):
-    """保存检测结果"""
+def save_result(result: str, image_path: str) -> List[Future]:
+    """
+    保存检测结果，写盘和可视化在后台线程中执行
+    
+    Returns:
+        后台任务列表，调用方可通过future.result()等待完成
+    """
     run_number = get_next_run_number()
     run_dir = f"Output/{run_number:03d}Run"
-    os.makedirs(run_dir, exist_ok=True)    # 保存原始结果
-    with open(f"{run_dir}/raw_response.txt", "w", encoding="utf-8") as f:
-        f.write(result)
+    os.makedirs(run_dir, exist_ok=True)
+    
+    # 保存原始结果
+    futures = [_IO_POOL.submit(_write_file, f"{run_dir}/raw_response.txt", result.encode("utf-8"))]
     
     print(f"💾 结果已保存: {run_dir}/raw_response.txt")
     
     # 解析和可视化
-    result_dict = sentence_to_dict(result)
+    result_dict = parse_llm_json(result, list_key="detection_results")
     
     if result_dict:
-        # 保存JSON
+        # 保存JSON并可视化
         json_file = f"{run_dir}/detection_results.json"
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(result_dict, f, ensure_ascii=False, indent=2)
-        
-        # 可视化
-        if quick_visualize(json_file, image_path):
-            basename = os.path.splitext(os.path.basename(image_path))[0]
-            print(f"🖼️ 标注图片: {run_dir}/{basename}_annotated.jpg")
-            print(f"📋 检测汇总: {run_dir}/detection_summary.txt")
+        json_data = JsonCodec.dumps_bytes(result_dict)
+        futures.append(_IO_POOL.submit(_save_and_visualize, json_file, json_data, image_path, run_dir))
     else:
         # 备用解析方法
         extract_and_save_json(result, run_number)
-
+    
+    return futures
 
 def main():
     """主函数 - 直接运行检测"""
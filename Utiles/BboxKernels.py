@@ -0,0 +1,150 @@
+"""
+边界框数值计算内核模块
+提供边界框坐标顺序修正、缩放和裁剪的批量计算，以及密集场景下的矩形边框绘制
+
+安装numba时使用 @njit 编译的原生循环（边界框数量较多时无解释器开销），
+未安装时回退到NumPy向量化实现，两者结果一致
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# 坐标转换为int64前先限制在该范围内，异常的超大坐标不会溢出回绕（之后仍由裁剪逻辑限制到图片范围）
+_COORD_LIMIT = float(2 ** 62)
+
+
+def _order_corners_numpy(boxes: np.ndarray) -> np.ndarray:
+    """修正坐标顺序（NumPy实现）"""
+    xy1 = np.minimum(boxes[:, :2], boxes[:, 2:])
+    xy2 = np.maximum(boxes[:, :2], boxes[:, 2:])
+    out = np.concatenate([xy1, xy2], axis=1)
+    np.clip(out, -_COORD_LIMIT, _COORD_LIMIT, out=out)
+    return out.astype(np.int64)
+
+
+def _scale_and_clip_numpy(boxes: np.ndarray, scale_factor: float, width: float, height: float) -> np.ndarray:
+    """缩放并裁剪坐标（NumPy实现）"""
+    out = boxes / scale_factor
+    np.clip(out, 0, (width, height, width, height), out=out)
+    return out
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _order_corners_numba(boxes):
+        """修正坐标顺序（numba实现）"""
+        out = np.empty(boxes.shape, dtype=np.int64)
+        for i in range(boxes.shape[0]):
+            x1, y1, x2, y2 = boxes[i, 0], boxes[i, 1], boxes[i, 2], boxes[i, 3]
+            out[i, 0] = int(min(max(min(x1, x2), -_COORD_LIMIT), _COORD_LIMIT))
+            out[i, 1] = int(min(max(min(y1, y2), -_COORD_LIMIT), _COORD_LIMIT))
+            out[i, 2] = int(min(max(max(x1, x2), -_COORD_LIMIT), _COORD_LIMIT))
+            out[i, 3] = int(min(max(max(y1, y2), -_COORD_LIMIT), _COORD_LIMIT))
+        return out
+
+    @njit(cache=True)
+    def _scale_and_clip_numba(boxes, scale_factor, width, height):
+        """缩放并裁剪坐标（numba实现）"""
+        out = np.empty_like(boxes)
+        for i in range(boxes.shape[0]):
+            for j in range(4):
+                limit = width if j % 2 == 0 else height
+                out[i, j] = min(max(boxes[i, j] / scale_factor, 0.0), limit)
+        return out
+
+    @njit(parallel=True, cache=True)
+    def _draw_rect_outlines_numba(image, boxes, colors, thickness):
+        """
+        将矩形边框直接写入图片（numba实现）
+
+        按行并行：每一行只由一个线程写入，行内按边界框顺序绘制，
+        边框重叠处与逐个绘制时一样由后面的边界框覆盖，结果是确定的
+        """
+        h, w = image.shape[0], image.shape[1]
+        r = thickness // 2
+        for y in prange(h):
+            for i in range(boxes.shape[0]):
+                x1 = min(boxes[i, 0], boxes[i, 2])
+                x2 = max(boxes[i, 0], boxes[i, 2])
+                y1 = min(boxes[i, 1], boxes[i, 3])
+                y2 = max(boxes[i, 1], boxes[i, 3])
+                # 上下两条边：y1、y2上下各r行内绘制整段 x1..x2
+                if abs(y - y1) <= r or abs(y - y2) <= r:
+                    for x in range(max(x1, 0), min(x2 + 1, w)):
+                        image[y, x, 0] = colors[i, 0]
+                        image[y, x, 1] = colors[i, 1]
+                        image[y, x, 2] = colors[i, 2]
+                # 左右两条边：y1..y2 范围内绘制 x1、x2 左右各r列
+                if y1 <= y <= y2:
+                    for k in range(-r, r + 1):
+                        for x in (x1 + k, x2 + k):
+                            if 0 <= x < w:
+                                image[y, x, 0] = colors[i, 0]
+                                image[y, x, 1] = colors[i, 1]
+                                image[y, x, 2] = colors[i, 2]
+
+    # 导入时预热一次，避免首次调用时才触发编译（cache=True时后续进程直接读取缓存）；
+    # 绘制内核只在密集场景使用，不在导入时编译，首次调用时再编译
+    _order_corners_numba(np.zeros((1, 4), dtype=np.float64))
+    _scale_and_clip_numba(np.zeros((1, 4), dtype=np.float64), 1.0, 1.0, 1.0)
+
+
+def order_corners(boxes: np.ndarray) -> np.ndarray:
+    """
+    修正边界框坐标顺序，保证 x1 <= x2、y1 <= y2，并截断为整数
+
+    Args:
+        boxes: (N, 4) float64 数组，每行为 [x1, y1, x2, y2]
+
+    Returns:
+        (N, 4) int64 数组（超大坐标先限制在±2^62内，不会溢出）
+    """
+    if njit is not None:
+        return _order_corners_numba(np.ascontiguousarray(boxes, dtype=np.float64))
+    return _order_corners_numpy(boxes)
+
+
+def scale_and_clip(boxes: np.ndarray, scale_factor: float, width: float, height: float) -> np.ndarray:
+    """
+    将处理后图片的边界框坐标除以缩放比例，并裁剪到原图范围内
+
+    Args:
+        boxes: (N, 4) float64 数组，每行为 [x1, y1, x2, y2]
+        scale_factor: 缩放比例
+        width: 原图宽度
+        height: 原图高度
+
+    Returns:
+        (N, 4) float64 数组
+    """
+    if njit is not None:
+        return _scale_and_clip_numba(np.ascontiguousarray(boxes, dtype=np.float64),
+                                     float(scale_factor), float(width), float(height))
+    return _scale_and_clip_numpy(boxes, scale_factor, width, height)
+
+
+def draw_rect_outlines(image: np.ndarray, boxes: np.ndarray, colors: np.ndarray, thickness: int) -> bool:
+    """
+    在图片上批量绘制矩形边框（仅在安装numba时可用，用于边界框数量非常多的场景）
+
+    边界框按顺序绘制，重叠处由后面的边界框覆盖；线宽不超过2时逐像素与cv2.rectangle一致，
+    更大的线宽只是近似。首次调用时才编译内核
+
+    Args:
+        image: (H, W, 3) uint8 图片，直接在其上绘制
+        boxes: (N, 4) int32 数组，每行为 [x1, y1, x2, y2]
+        colors: (N, 3) uint8 数组，每个边界框的颜色
+        thickness: 线宽
+
+    Returns:
+        是否已绘制，未安装numba时返回False，由调用方改用OpenCV绘制
+    """
+    if njit is None:
+        return False
+    _draw_rect_outlines_numba(image, np.ascontiguousarray(boxes, dtype=np.int32),
+                              np.ascontiguousarray(colors, dtype=np.uint8), int(thickness))
+    return True
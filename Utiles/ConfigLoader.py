@@ -0,0 +1,60 @@
+"""
+配置加载工具模块
+为所有Agent提供带缓存的YAML配置加载功能
+
+同一进程内的重复加载通过 lru_cache 直接命中，以文件修改时间和文件大小作为失效依据；
+每次返回解析结果的深拷贝，各Agent之间不共享可变的配置字典。
+"""
+
+import copy
+import os
+import functools
+from typing import Dict, Any
+
+import yaml
+
+# 优先使用libyaml提供的C加载器，不可用时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config_cached(config_path: str, mtime_ns: int, file_size: int) -> Dict[str, Any]:
+    """
+    加载配置文件（按路径、修改时间和文件大小缓存）
+
+    Args:
+        config_path: YAML配置文件路径
+        mtime_ns: YAML文件的修改时间（纳秒），仅用于缓存失效
+        file_size: YAML文件大小，仅用于缓存失效
+
+    Returns:
+        配置字典（缓存对象本身，调用方不应修改）
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """
+    加载配置文件
+
+    Args:
+        config_path: YAML配置文件路径
+
+    Returns:
+        配置字典（每次调用返回独立的副本）
+
+    Raises:
+        FileNotFoundError: 当配置文件不存在时
+        ValueError: 当配置文件格式错误时
+    """
+    try:
+        stat = os.stat(config_path)
+        return copy.deepcopy(_load_config_cached(config_path, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        raise FileNotFoundError(f"配置文件 {config_path} 未找到")
+    except yaml.YAMLError as e:
+        raise ValueError(f"配置文件格式错误: {e}")
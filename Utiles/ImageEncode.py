@@ -0,0 +1,141 @@
+"""
+图片编码工具模块
+将本地图片编码为base64数据URL，并按(路径, 修改时间, 文件大小)缓存结果，
+多个Agent处理同一张图片时只需读取和编码一次
+"""
+
+import functools
+import mmap
+import os
+from typing import Optional
+
+from PIL import Image
+
+from Utiles.ImagePreprocessor import ImagePreprocessor
+
+# 优先使用pybase64（SIMD加速），未安装时回退到标准库base64
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
+
+# 扩展名到MIME类型的映射，仅在无法通过文件头识别格式时使用
+_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+
+def _sniff_mime(head: bytes) -> Optional[str]:
+    """
+    根据文件头（magic bytes）判断图片的MIME类型
+
+    Args:
+        head: 文件开头的至少12个字节
+
+    Returns:
+        MIME类型，无法识别时返回None
+    """
+    if head[:3] == b'\xff\xd8\xff':
+        return 'image/jpeg'
+    if head[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'image/png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def _detect_mime(head: bytes, image_path: str) -> str:
+    """优先根据文件头判断格式，无法识别时再根据扩展名判断"""
+    file_ext = os.path.splitext(image_path)[1].lower()
+    return _sniff_mime(head) or _MIME_TYPES.get(file_ext, 'image/jpeg')
+
+
+def _recompress_to_jpeg(image_path: str) -> bytes:
+    """将非JPEG图片（如PNG）在内存中重新压缩为JPEG，显著减小请求体"""
+    preprocessor = ImagePreprocessor()
+    with Image.open(image_path) as image:
+        rgb_image = preprocessor.convert_to_rgb(image)
+        return preprocessor.compress_image(rgb_image)
+
+
+@functools.lru_cache(maxsize=8)
+def encode_data_url(image_path: str, mtime: float, size: int) -> str:
+    """
+    将本地图片转换为base64数据URL，非JPEG图片会先重新压缩为JPEG
+
+    Args:
+        image_path: 图片文件路径
+        mtime: 文件修改时间，仅用于缓存失效
+        size: 文件大小，仅用于缓存失效
+
+    Returns:
+        base64编码的图片数据URL
+    """
+    with open(image_path, "rb") as image_file:
+        try:
+            # 通过mmap直接读取文件内容，避免先读入完整副本
+            with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                is_jpeg = _detect_mime(mm[:12], image_path) == 'image/jpeg'
+                encoded = b64encode(mm) if is_jpeg else None
+        except ValueError:
+            # 空文件无法mmap
+            encoded = b""
+
+    if encoded is None:
+        encoded = b64encode(_recompress_to_jpeg(image_path))
+
+    return (b"data:image/jpeg;base64," + encoded).decode('ascii')
+
+
+@functools.lru_cache(maxsize=8)
+def jpeg_bytes_to_data_url(jpeg_data: bytes) -> str:
+    """
+    将JPEG字节数据转换为base64数据URL（带缓存）
+
+    预处理结果按文件缓存后返回同一个bytes对象，其哈希值只计算一次，
+    多个Agent发送同一张预处理图片时只编码一次
+
+    Args:
+        jpeg_data: JPEG字节数据
+
+    Returns:
+        base64编码的图片数据URL
+    """
+    return (b"data:image/jpeg;base64," + b64encode(jpeg_data)).decode('ascii')
+
+
+def load_jpeg_bytes(image_path: str) -> bytes:
+    """
+    读取本地图片的JPEG字节数据，非JPEG图片会先重新压缩为JPEG
+
+    Args:
+        image_path: 图片文件路径
+
+    Returns:
+        JPEG字节数据
+    """
+    with open(image_path, "rb") as image_file:
+        data = image_file.read()
+    if not data or _detect_mime(data[:12], image_path) == 'image/jpeg':
+        return data
+    return _recompress_to_jpeg(image_path)
+
+
+def encode_image_to_data_url(image_path: str) -> str:
+    """
+    将本地图片转换为base64数据URL（带缓存）
+
+    Args:
+        image_path: 图片文件路径
+
+    Returns:
+        base64编码的图片数据URL
+    """
+    stat = os.stat(image_path)
+    return encode_data_url(image_path, stat.st_mtime, stat.st_size)
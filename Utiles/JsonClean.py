@@ -0,0 +1,18 @@
+"""
+JSON清理工具模块
+从大模型回答的markdown代码块中提取JSON内容
+"""
+
+import re
+
+# 匹配以```或```json开头的代码块；只有位于行首的```或文本末尾的```才视为结束标记
+# （JSON字符串内部的```不会截断内容），结束标记缺失时取到文本末尾
+_FENCE_RE = re.compile(r'\A```(?:json)?[ \t]*\n?(.*?)\s*(?:^[ \t]*```[ \t]*$|```\Z|\Z)',
+                       re.DOTALL | re.MULTILINE)
+
+
+def clean_json_from_markdown(text: str) -> str:
+    """从markdown代码块中提取JSON内容"""
+    text = text.strip()
+    match = _FENCE_RE.match(text)
+    return match.group(1) if match else text
@@ -0,0 +1,97 @@
+"""
+JSON编解码工具模块
+优先使用orjson（C实现，编解码速度远快于标准库），未安装时回退到标准库json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 标准库回退路径复用同一个解码器实例
+_DECODER = json.JSONDecoder()
+
+# 标准库回退路径的紧凑输出分隔符（不含多余空格）
+_COMPACT_SEPARATORS = (',', ':')
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获此异常即可
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    解析JSON数据
+
+    Args:
+        data: JSON字符串或UTF-8字节数据
+
+    Returns:
+        解析后的Python对象
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson拒绝包含孤立代理字符等无效UTF-8内容的字符串，交给标准库再尝试一次
+            if not isinstance(data, str):
+                raise
+    if isinstance(data, str):
+        return _DECODER.decode(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """
+    将对象序列化为UTF-8编码的JSON字节数据，用于HTTP请求体和结果文件
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否使用2空格缩进输出（仅用于需要人工阅读的文件，机器读取的结果文件使用紧凑格式）
+
+    Returns:
+        JSON字节数据
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT_SEPARATORS).encode('utf-8')
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    将对象序列化为JSON字符串（保留非ASCII字符）
+
+    Args:
+        obj: 要序列化的对象
+        indent: 是否使用2空格缩进输出
+
+    Returns:
+        JSON字符串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode('utf-8')
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT_SEPARATORS)
+
+
+def loads_response(response, chunk_size: int = 64 * 1024) -> Any:
+    """
+    分块读取HTTP响应体并解析JSON，配合 stream=True 使用，
+    读取网络数据时直接写入同一个bytearray，不再额外拼接完整副本
+
+    Args:
+        response: requests的响应对象
+        chunk_size: 每次读取的字节数
+
+    Returns:
+        解析后的Python对象
+    """
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer.extend(chunk)
+    return loads(buffer)
@@ -0,0 +1,136 @@
+"""
+大模型回答解析工具模块
+从大模型回答中提取并解析JSON，可选地验证和修正边界框数据
+"""
+
+import math
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from Utiles import JsonCodec
+from Utiles.BboxKernels import order_corners
+from Utiles.JsonClean import clean_json_from_markdown
+
+
+def _bbox_to_floats(bbox: list) -> Optional[List[float]]:
+    """将单个边界框转换为浮点数列表，坐标无效时返回None"""
+    try:
+        values = [float(v) for v in bbox]
+    except (ValueError, TypeError):
+        return None
+    return values if all(map(math.isfinite, values)) else None
+
+
+def _bboxes_to_array(bboxes: list) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将边界框列表转换为 (N, 4) 浮点数组
+
+    Returns:
+        (坐标数组, 每个边界框是否有效的布尔数组)，无效边界框的坐标置为0
+    """
+    try:
+        boxes = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+        valid = np.isfinite(boxes).all(axis=1)
+    except (ValueError, TypeError):
+        # 存在无法转换为数值的坐标时逐个转换，定位无效的边界框
+        rows = [_bbox_to_floats(bbox) for bbox in bboxes]
+        valid = np.array([row is not None for row in rows], dtype=bool)
+        boxes = np.array([row or [0.0] * 4 for row in rows], dtype=np.float64).reshape(-1, 4)
+    boxes[~valid] = 0.0
+    return boxes, valid
+
+
+def validate_bbox_results(results: list) -> list:
+    """
+    验证和修复结果列表中的边界框数据
+
+    跳过格式不正确或坐标无效的结果，修正坐标顺序（x1 <= x2、y1 <= y2）并截断为整数
+
+    Args:
+        results: 结果列表，每个元素应包含bbox_2d字段
+
+    Returns:
+        验证通过的结果列表
+    """
+    # 先检查结构，收集待验证的边界框（结果字典直接引用，不做拷贝）
+    candidates = []
+    bboxes = []
+    # 警告信息先收集，最后一次性输出（结果较多时避免逐条print）
+    warnings = []
+    for i, item in enumerate(results):
+        if isinstance(item, dict):
+            # 检查bbox_2d字段
+            bbox = item.get('bbox_2d', [])
+            if not isinstance(bbox, list) or len(bbox) != 4:
+                warnings.append(f"警告：结果 {i} 的边界框数据无效，已跳过: {bbox}")
+                continue
+            candidates.append((i, item))
+            bboxes.append(bbox)
+        else:
+            warnings.append(f"警告：结果 {i} 格式不正确，已跳过")
+            continue
+
+    # 没有结构正确的结果时直接返回，无需构建数组
+    if not candidates:
+        if warnings:
+            print("\n".join(warnings))
+        return []
+    
+    # 批量检查坐标并修正坐标顺序
+    boxes, valid = _bboxes_to_array(bboxes)
+    fixed_boxes = order_corners(boxes).tolist()
+
+    validated_results = []
+    for (i, item), is_valid, fixed_bbox in zip(candidates, valid, fixed_boxes):
+        if not is_valid:
+            warnings.append(f"警告：结果 {i} 的边界框坐标无效，已跳过: {item['bbox_2d']}")
+            continue
+
+        # 更新修正后的坐标
+        item['bbox_2d'] = fixed_bbox
+        validated_results.append(item)
+
+    if warnings:
+        print("\n".join(warnings))
+    return validated_results
+
+
+def parse_llm_json(text: str, validate_bboxes: bool = False, list_key: Optional[str] = None) -> Any:
+    """
+    解析大模型回答中的JSON内容
+
+    Args:
+        text: 大模型回答文本（可包含markdown代码块）
+        validate_bboxes: 结果为列表时是否验证和修复其中的边界框数据
+        list_key: 结果为列表时包装成 {list_key: 列表} 的字典，为None时直接返回列表
+
+    Returns:
+        解析后的结果，解析失败时返回空字典
+    """
+    try:
+        if not isinstance(text, str):
+            return {}
+
+        # 清理markdown格式（内部已去除首尾空白）
+        cleaned_text = clean_json_from_markdown(text)
+        if not cleaned_text:
+            return {}
+
+        # 解析JSON
+        parsed_result = JsonCodec.loads(cleaned_text)
+
+        if isinstance(parsed_result, list):
+            if validate_bboxes:
+                parsed_result = validate_bbox_results(parsed_result)
+            if list_key is not None:
+                # 如果是列表，包装成字典格式
+                return {list_key: parsed_result}
+        return parsed_result
+
+    except JsonCodec.JSONDecodeError as e:
+        print(f"JSON格式解析失败: {e}")
+        return {}
+    except Exception as e:
+        print(f"字符串转换失败: {e}")
+        return {}
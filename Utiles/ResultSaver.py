@@ -4,9 +4,48 @@
 """
 
 import os
-import json
 import re
-from typing import Optional, Dict, Any
+import string
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+from Utiles import JsonCodec
+
+# 非POSIX平台没有fcntl，此时退回到扫描目录
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 保存下一个运行序号的计数文件名
+RUN_COUNTER_FILE = ".next_run"
+
+# 运行目录名，如"007Run"；ResultBundle打包的运行结果为"007Run.zip"
+_RUN_DIR_RE = re.compile(r'^(\d+)Run(\.zip)?$')
+
+
+def _extract_fenced_json(answer: str) -> str:
+    """
+    从回答中提取```json代码块的内容，使用str.find定位代码块标记
+    
+    没有```json标记时返回整个回答，并移除可能存在的其他markdown代码块标记
+    """
+    start = answer.find('```json')
+    if start >= 0:
+        start += len('```json')
+        end = answer.find('```', start)
+        return (answer[start:end] if end >= 0 else answer[start:]).strip()
+    
+    # 如果没有找到```json```标记，尝试直接解析整个回答
+    json_str = answer.strip()
+    # 如果以```开始，移除markdown标记
+    if json_str.startswith('```'):
+        json_str = json_str[3:].lstrip(string.ascii_letters).lstrip()
+        if json_str.endswith('```'):
+            json_str = json_str[:-3].rstrip()
+    return json_str
 
 
 class ResultSaver:
@@ -22,20 +61,61 @@ class ResultSaver:
         self.output_base_dir = output_base_dir
     
     def get_next_run_number(self) -> int:
-        """获取下一个运行序号"""
+        """
+        获取下一个运行序号
+        
+        序号保存在输出目录的计数文件中，加文件锁读取并递增，无需每次扫描整个输出目录；
+        计数文件不存在时扫描一次目录作为初始值。计数文件可能过期（被复制、手动修改，
+        或运行目录由其他程序创建），因此会跳过已存在运行目录或结果包的序号。
+        不支持fcntl的平台（如Windows）直接扫描目录
+        
+        Returns:
+            运行序号
+        """
+        if fcntl is None:
+            return self._scan_next_run_number()
+        
+        os.makedirs(self.output_base_dir, exist_ok=True)
+        counter_path = os.path.join(self.output_base_dir, RUN_COUNTER_FILE)
+        fd = os.open(counter_path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 32).strip()
+            try:
+                run_number = int(raw) if raw else self._scan_next_run_number()
+            except ValueError:
+                run_number = self._scan_next_run_number()
+            
+            # 跳过已被占用的序号，避免覆盖已有的运行结果
+            while self._run_exists(run_number):
+                run_number += 1
+            
+            # 写回下一个序号（本次序号已被占用）
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, str(run_number + 1).encode('ascii'), 0)
+            return run_number
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+    
+    def _run_exists(self, run_number: int) -> bool:
+        """检查该序号的运行目录或结果包是否已存在"""
+        run_path = os.path.join(self.output_base_dir, f"{run_number:03d}Run")
+        return os.path.exists(run_path) or os.path.exists(run_path + ".zip")
+    
+    def _scan_next_run_number(self) -> int:
+        """扫描输出目录获取下一个运行序号"""
         if not os.path.exists(self.output_base_dir):
             os.makedirs(self.output_base_dir)
             return 0
         
-        # 找到最大的Run序号
+        # 找到最大的Run序号（DirEntry缓存了文件类型，无需再次stat）
         max_num = -1
-        for item in os.listdir(self.output_base_dir):
-            if item.endswith("Run") and os.path.isdir(os.path.join(self.output_base_dir, item)):
-                try:
-                    num = int(item.replace("Run", ""))
-                    max_num = max(max_num, num)
-                except ValueError:
-                    continue
+        with os.scandir(self.output_base_dir) as entries:
+            for entry in entries:
+                match = _RUN_DIR_RE.match(entry.name)
+                if match and (match.group(2) or entry.is_dir()):
+                    max_num = max(max_num, int(match.group(1)))
         
         return max_num + 1
     
@@ -59,38 +139,38 @@ class ResultSaver:
         run_dir = self.create_run_directory(run_number)
         
         try:
-            # 使用正则表达式提取JSON内容
-            json_pattern = r'```json\s*(.*?)\s*```'
-            json_match = re.search(json_pattern, answer, re.DOTALL)
-            
-            if json_match:
-                json_str = json_match.group(1).strip()
-            else:
-                # 如果没有找到```json```标记，尝试直接解析整个回答
-                json_str = answer.strip()
-                # 如果以```开始，移除markdown标记
-                if json_str.startswith('```'):
-                    json_str = re.sub(r'^```[a-zA-Z]*\s*', '', json_str)
-                    json_str = re.sub(r'\s*```$', '', json_str)
-            
-            # 尝试解析JSON
-            detection_results = json.loads(json_str)
+            detection_results = self.parse_fenced_json(answer)
+            if detection_results is None:
+                return None
             
             # 保存JSON文件
             json_file = os.path.join(run_dir, "detection_results.json")
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(detection_results, f, indent=2, ensure_ascii=False)
+            Path(json_file).write_bytes(JsonCodec.dumps_bytes(detection_results))
             
             return json_file
             
-        except json.JSONDecodeError as e:
+        except Exception as e:
+            print(f"⚠️ 保存JSON时发生错误: {e}")
+            return None
+    
+    @staticmethod
+    def parse_fenced_json(answer: str) -> Optional[Any]:
+        """
+        从回答中提取JSON内容并解析
+        
+        Args:
+            answer: AI回答内容
+            
+        Returns:
+            解析后的对象，如果解析失败返回None
+        """
+        try:
+            return JsonCodec.loads(_extract_fenced_json(answer))
+        except JsonCodec.JSONDecodeError as e:
             print(f"⚠️ JSON解析失败: {e}")
             print("原始回答内容:")
             print(answer)
             return None
-        except Exception as e:
-            print(f"⚠️ 保存JSON时发生错误: {e}")
-            return None
     
     def save_session_info(self, question: str, image_path: str, run_number: int) -> str:
         """
@@ -114,14 +194,12 @@ class ResultSaver:
         }
         
         session_file = os.path.join(run_dir, "session_info.json")
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_info, f, indent=2, ensure_ascii=False)
+        Path(session_file).write_bytes(JsonCodec.dumps_bytes(session_info, indent=True))
         
         return session_file
     
     def _get_timestamp(self) -> str:
         """获取当前时间戳"""
-        from datetime import datetime
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
@@ -149,6 +227,61 @@ class ResultSaver:
             return None
 
 
+class ResultBundle:
+    """
+    运行结果打包写入器
+    
+    将一次运行的所有输出文件写入同一个不压缩的zip文件（如"Output/007Run.zip"），
+    代替在运行目录中逐个创建小文件，减少文件打开/关闭和目录元数据操作，
+    输出目录位于网络存储时效果明显
+    
+    用法:
+        with ResultBundle(run_number) as bundle:
+            bundle.write("raw_response.txt", answer)
+            bundle.write_json("results.json", result_dict)
+    """
+    
+    def __init__(self, run_number: int, output_base_dir: str = "Output"):
+        """
+        初始化结果打包写入器
+        
+        Args:
+            run_number: 运行序号
+            output_base_dir: 输出基础目录
+        """
+        self.path = os.path.join(output_base_dir, f"{run_number:03d}Run.zip")
+        self._zip = None
+    
+    def __enter__(self) -> "ResultBundle":
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._zip = zipfile.ZipFile(self.path, 'w', compression=zipfile.ZIP_STORED)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._zip.close()
+        self._zip = None
+    
+    def write(self, name: str, data: Union[str, bytes]) -> str:
+        """
+        写入一个文件
+        
+        Args:
+            name: 包内文件名
+            data: 文件内容，字符串按UTF-8编码
+            
+        Returns:
+            用于显示的包内文件位置，如"Output/007Run.zip:raw_response.txt"（并非磁盘上的路径）
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._zip.writestr(name, data)
+        return f"{self.path}:{name}"
+    
+    def write_json(self, name: str, obj: Any, indent: bool = False) -> str:
+        """写入一个JSON文件，返回用于显示的包内文件位置"""
+        return self.write(name, JsonCodec.dumps_bytes(obj, indent=indent))
+
+
 # 便捷函数
 def get_next_run_number(output_dir: str = "Output") -> int:
     """便捷函数：获取下一个运行序号"""
@@ -3,32 +3,158 @@
 将检测结果可视化到原始图片上
 """
 
-import json
 import cv2
+import functools
 import numpy as np
 import os
-import colorsys
+import stat
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from Utiles import JsonCodec
+from Utiles.BboxKernels import draw_rect_outlines
+
+# 优先使用libjpeg-turbo保存JPEG标注图片，不可用时使用cv2.imwrite
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+    _TURBO_JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _TURBO_JPEG = None
+
+# 缩小倍数到OpenCV读取标志的映射，JPEG图片在解码时直接按比例缩小（跳过部分IDCT计算）
+_REDUCED_READ_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8
+}
+
+# 保存时可使用TurboJPEG编码的扩展名
+_JPEG_EXTENSIONS = frozenset({'.jpg', '.jpeg'})
+
+
+def _is_regular_file(path: str) -> bool:
+    """一次stat同时检查路径是否存在且为普通文件"""
+    try:
+        return stat.S_ISREG(os.stat(path).st_mode)
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _color_table(num_colors: int) -> Tuple[np.ndarray, Tuple[Tuple[int, int, int], ...]]:
+    """
+    生成标注颜色表（每种颜色数量只计算一次）
+    
+    Args:
+        num_colors: 颜色数量
+        
+    Returns:
+        (只读的 (N, 3) uint8 BGR颜色数组, OpenCV绘图接口使用的Python整数元组)
+    """
+    # 批量进行HSV到RGB的转换（与colorsys.hsv_to_rgb的分段公式一致）
+    hue = np.arange(num_colors) / num_colors
+    saturation = 0.8
+    value = 0.9
+    sector = (hue * 6.0).astype(np.int64)
+    f = hue * 6.0 - sector
+    p = np.full(num_colors, value * (1.0 - saturation))
+    q = value * (1.0 - saturation * f)
+    t = value * (1.0 - saturation * (1.0 - f))
+    v = np.full(num_colors, value)
+    sector %= 6
+    conditions = [sector == k for k in range(6)]
+    r = np.select(conditions, [v, q, p, p, t, v])
+    g = np.select(conditions, [t, v, v, q, p, p])
+    b = np.select(conditions, [p, p, t, v, v, q])
+    
+    # 直接按BGR顺序（OpenCV使用BGR）写入连续的uint8颜色表，供批量绘制使用
+    colors_bgr = np.empty((num_colors, 3), dtype=np.uint8)
+    colors_bgr[:, 0] = b * 255
+    colors_bgr[:, 1] = g * 255
+    colors_bgr[:, 2] = r * 255
+    colors_bgr.flags.writeable = False
+    return colors_bgr, tuple(tuple(color) for color in colors_bgr.tolist())
+
+
+@functools.lru_cache(maxsize=256)
+def _text_size(text: str, font_scale: float, thickness: int) -> Tuple[Tuple[int, int], int]:
+    """计算标签文本尺寸（带缓存，批量或重复可视化时相同的标签文本只计算一次）"""
+    return cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)
+
+
+@functools.lru_cache(maxsize=64)
+def _load_json_file(json_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    读取并解析JSON文件，按(路径, 修改时间, 文件大小)缓存结果，重复可视化同一结果文件时无需重新解析
+    
+    Args:
+        json_path: JSON文件路径
+        mtime_ns: 文件修改时间，仅用于缓存失效
+        size: 文件大小，仅用于缓存失效
+        
+    Returns:
+        解析后的对象（缓存共享，调用方不应修改）
+    """
+    # 以字节读取，直接交给JsonCodec解析（orjson可用时无需先解码为字符串）
+    return JsonCodec.loads(Path(json_path).read_bytes())
+
+
+@dataclass
+class VisualizeJob:
+    """单次可视化任务，输出目录和图片文件名只解析一次"""
+    
+    __slots__ = ('json_path', 'image_path', 'output_dir', 'stem')
+    
+    json_path: str
+    image_path: str
+    output_dir: str
+    stem: str
+    
+    @classmethod
+    def create(cls, json_path: str, image_path: str, output_dir: Optional[str] = None) -> "VisualizeJob":
+        """
+        创建可视化任务
+        
+        Args:
+            json_path: 检测结果JSON文件路径
+            image_path: 原始图片路径
+            output_dir: 输出目录，如果为None则使用JSON文件所在目录
+        """
+        if output_dir is None:
+            output_dir = os.path.dirname(json_path)
+        return cls(json_path, image_path, output_dir, Path(image_path).stem)
 
 
 class DetectionVisualizer:
     """检测结果可视化类"""
     
-    def __init__(self):
-        """初始化可视化器"""
-        self.colors = []
+    # 标注图片的JPEG质量（预览用途，与OpenCV默认的95相比视觉上无差别且文件更小）
+    JPEG_QUALITY = 85
+    # 边界框数量超过该值且安装了numba时，使用编译内核直接绘制边框
+    DENSE_THRESHOLD = 1000
+    
+    def __init__(self, reuse_buffer: bool = False):
+        """
+        初始化可视化器
+        
+        Args:
+            reuse_buffer: 非原地绘制时是否复用同一块缓冲区代替每次复制图片。
+                开启后返回的标注图片在下一次绘制时会被覆盖，且不能在多个线程间共享同一个可视化器
+        """
+        self.reuse_buffer = reuse_buffer
+        self._scratch: Optional[np.ndarray] = None
+        # 已确认存在的输出目录，批量保存到同一目录时无需重复创建
+        self._ensured_dirs = set()
         self._generate_colors(20)  # 生成20种不同的颜色
     
     def _generate_colors(self, num_colors: int):
-        """生成不同的颜色用于标注不同的对象"""
-        for i in range(num_colors):
-            hue = i / num_colors
-            saturation = 0.8
-            value = 0.9
-            rgb = colorsys.hsv_to_rgb(hue, saturation, value)            # 转换为BGR格式（OpenCV使用BGR）
-            color = (int(rgb[2] * 255), int(rgb[1] * 255), int(rgb[0] * 255))
-            self.colors.append(color)
+        """生成不同的颜色用于标注不同的对象（颜色表在所有实例间共享）"""
+        self.colors_bgr, self.colors = _color_table(num_colors)
     
     def load_detection_results(self, json_path: str) -> List[Dict[str, Any]]:
         """
@@ -41,23 +167,24 @@ class DetectionVisualizer:
             检测结果列表
         """
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                results = json.load(f)
+            stat = os.stat(json_path)
+            results = _load_json_file(json_path, stat.st_mtime_ns, stat.st_size)
               # 处理不同的数据格式
             if isinstance(results, list):
                 # 直接是列表格式
                 print(f"成功加载检测结果，共 {len(results)} 个对象")
-                return results
+                # 返回列表副本，避免调用方修改缓存的结果
+                return list(results)
             elif isinstance(results, dict):
                 # 字典格式，查找检测或分割结果
                 if 'detection_results' in results:
                     detections = results['detection_results']
                     print(f"成功加载检测结果，共 {len(detections)} 个对象")
-                    return detections
+                    return list(detections)
                 elif 'segmentation_results' in results:
                     detections = results['segmentation_results']
                     print(f"成功加载分割结果，共 {len(detections)} 个对象")
-                    return detections
+                    return list(detections)
                 else:
                     # 假设整个字典就是单个检测结果
                     print("成功加载检测结果，共 1 个对象")
@@ -69,71 +196,140 @@ class DetectionVisualizer:
         except FileNotFoundError:
             print(f"错误：找不到检测结果文件 {json_path}")
             return []
-        except json.JSONDecodeError as e:
+        except JsonCodec.JSONDecodeError as e:
             print(f"错误：JSON文件格式错误 - {e}")
             return []
     
-    def load_image(self, image_path: str) -> Optional[np.ndarray]:
+    def load_image(self, image_path: str, reduce: int = 1) -> Optional[np.ndarray]:
         """
         加载原始图片
         
         Args:
             image_path: 图片文件路径
+            reduce: 解码时的缩小倍数，可选1、2、4、8
             
         Returns:
             图片数组，如果加载失败返回None
+            
+        Raises:
+            ValueError: 当缩小倍数无效时
         """
-        if not os.path.exists(image_path):
-            print(f"错误：找不到图片文件 {image_path}")
-            return None
+        if reduce not in _REDUCED_READ_FLAGS:
+            raise ValueError(f"缩小倍数必须是1、2、4或8: {reduce}")
         
-        image = cv2.imread(image_path)
+        # 不预先检查文件是否存在，cv2.imread在文件不存在或无法解码时都返回None
+        image = cv2.imread(image_path, _REDUCED_READ_FLAGS[reduce])
         if image is None:
-            print(f"错误：无法读取图片文件 {image_path}")
+            print(f"错误：找不到或无法读取图片文件 {image_path}")
             return None
         
         print(f"成功加载图片，尺寸: {image.shape[1]}x{image.shape[0]}")
         return image
     
-    def draw_bounding_boxes(self, image: np.ndarray, detections: List[Dict[str, Any]]) -> np.ndarray:
+    def _copy_to_scratch(self, image: np.ndarray) -> np.ndarray:
+        """将图片复制到复用的缓冲区中，缓冲区按见过的最大尺寸分配"""
+        h, w = image.shape[:2]
+        scratch = self._scratch
+        compatible = (scratch is not None and scratch.shape[2:] == image.shape[2:]
+                      and scratch.dtype == image.dtype)
+        if not compatible or scratch.shape[0] < h or scratch.shape[1] < w:
+            h_alloc, w_alloc = (max(h, scratch.shape[0]), max(w, scratch.shape[1])) if compatible else (h, w)
+            scratch = self._scratch = np.empty((h_alloc, w_alloc) + image.shape[2:], dtype=image.dtype)
+        view = scratch[:h, :w]
+        np.copyto(view, image)
+        return view
+    
+    @staticmethod
+    def _summary_records(detections: List[Dict[str, Any]]) -> List[Tuple[int, Any, Optional[list]]]:
+        """
+        读取每个检测结果的序号、标签和边界框
+        
+        Returns:
+            (序号, 标签, 边界框) 列表，边界框格式不正确时为None
+        """
+        records = []
+        for i, detection in enumerate(detections):
+            bbox = detection.get('bbox_2d', [])
+            label = detection.get('label', 'Unknown')
+            records.append((i + 1, label, bbox if len(bbox) == 4 else None))
+        return records
+    
+    def draw_bounding_boxes(self, image: np.ndarray, detections: List[Dict[str, Any]],
+                            inplace: bool = False, verbose: bool = False,
+                            return_records: bool = False, scale: float = 1.0):
         """
         在图片上绘制边界框和标签
         
         Args:
             image: 原始图片
             detections: 检测结果列表
+            inplace: 是否直接在原始图片上绘制（为True时不再保留原始图片内容）
+            verbose: 是否输出每个对象的绘制信息（绘制完成后一次性输出）
+            return_records: 是否同时返回已读取的 (序号, 标签, 边界框) 记录，供create_summary_text复用
+            scale: 绘制前对边界框坐标的缩放比例（图片以缩小倍数加载时为 1/倍数）
             
         Returns:
-            绘制了标注的图片
+            绘制了标注的图片；return_records为True时返回 (图片, 记录列表)
         """
-        # 复制图片以避免修改原始图片
-        annotated_image = image.copy()
+        # 默认复制图片以避免修改原始图片
+        if inplace:
+            annotated_image = image
+        elif self.reuse_buffer:
+            annotated_image = self._copy_to_scratch(image)
+        else:
+            annotated_image = image.copy()
+        h, w = annotated_image.shape[:2]
         
-        for i, detection in enumerate(detections):
-            # 获取边界框坐标
-            bbox = detection.get('bbox_2d', [])
-            label = detection.get('label', 'Unknown')
-            
-            if len(bbox) != 4:
-                print(f"警告：检测结果 {i} 的边界框格式不正确: {bbox}")
+        # 检查边界框格式，收集有效的检测结果
+        records = self._summary_records(detections)
+        valid_indices = []
+        warnings = []
+        for i, (_, _, bbox) in enumerate(records):
+            if bbox is None:
+                warnings.append(f"警告：检测结果 {i} 的边界框格式不正确: {detections[i].get('bbox_2d', [])}")
                 continue
-            
-            x1, y1, x2, y2 = bbox
-            
-            # 确保坐标在图片范围内
-            h, w = annotated_image.shape[:2]
-            x1 = max(0, min(x1, w-1))
-            y1 = max(0, min(y1, h-1))
-            x2 = max(0, min(x2, w-1))
-            y2 = max(0, min(y2, h-1))
+            valid_indices.append(i)
+        if warnings:
+            print("\n".join(warnings))
+        
+        # 没有可绘制的边界框时直接返回
+        if not valid_indices:
+            return (annotated_image, records) if return_records else annotated_image
+        
+        # 批量将坐标裁剪到图片范围内并转换为整数
+        bboxes = np.array([records[i][2] for i in valid_indices], dtype=np.float64).reshape(-1, 4)
+        if scale != 1.0:
+            bboxes *= scale
+        np.clip(bboxes, 0, (w - 1, h - 1, w - 1, h - 1), out=bboxes)
+        bboxes = bboxes.astype(np.int32)
+        
+        # 过滤裁剪后面积为0的边界框（包括完全位于图片外的），不再绘制
+        non_degenerate = (bboxes[:, 0] != bboxes[:, 2]) & (bboxes[:, 1] != bboxes[:, 3])
+        if not non_degenerate.all():
+            skipped = [valid_indices[k] for k in np.flatnonzero(~non_degenerate).tolist()]
+            print(f"警告：检测结果 {skipped} 的边界框面积为0，已跳过绘制")
+            valid_indices = [valid_indices[k] for k in np.flatnonzero(non_degenerate).tolist()]
+            bboxes = bboxes[non_degenerate]
+        
+        # 先绘制所有边框，标签绘制在边框之上
+        thickness = 2
+        color_ids = np.asarray(valid_indices, dtype=np.int64) % len(self.colors)
+        dense = (len(valid_indices) > self.DENSE_THRESHOLD and annotated_image.dtype == np.uint8
+                 and annotated_image.ndim == 3 and annotated_image.shape[2] == 3)
+        if not (dense and draw_rect_outlines(annotated_image, bboxes, self.colors_bgr[color_ids], thickness)):
+            # 按颜色分组，每种颜色用一次polylines绘制所有边界框
+            corners = bboxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 1, 2)
+            for color_id in np.unique(color_ids).tolist():
+                cv2.polylines(annotated_image, list(corners[color_ids == color_id]), True,
+                              self.colors[color_id], thickness)
+        
+        log_lines = []
+        for i, (x1, y1, x2, y2) in zip(valid_indices, bboxes.tolist()):
+            label = records[i][1]
             
             # 选择颜色
             color = self.colors[i % len(self.colors)]
             
-            # 绘制边界框
-            thickness = 2
-            cv2.rectangle(annotated_image, (int(x1), int(y1)), (int(x2), int(y2)), color, thickness)
-            
             # 准备标签文本
             label_text = f"{i+1}: {label}"
             
@@ -141,22 +337,28 @@ class DetectionVisualizer:
             font = cv2.FONT_HERSHEY_SIMPLEX
             font_scale = 0.6
             text_thickness = 1
-            (text_width, text_height), baseline = cv2.getTextSize(label_text, font, font_scale, text_thickness)
+            (text_width, text_height), baseline = _text_size(label_text, font_scale, text_thickness)
             
             # 绘制标签背景
-            label_y = max(int(y1), text_height + 5)
+            label_y = max(y1, text_height + 5)
             cv2.rectangle(annotated_image, 
-                         (int(x1), label_y - text_height - 5), 
-                         (int(x1) + text_width + 5, label_y + baseline), 
+                         (x1, label_y - text_height - 5), 
+                         (x1 + text_width + 5, label_y + baseline), 
                          color, -1)
             
             # 绘制标签文本
             cv2.putText(annotated_image, label_text, 
-                       (int(x1) + 2, label_y - 2), 
+                       (x1 + 2, label_y - 2), 
                        font, font_scale, (255, 255, 255), text_thickness)
             
-            print(f"绘制对象 {i+1}: {label} at [{x1}, {y1}, {x2}, {y2}]")
+            if verbose:
+                log_lines.append(f"绘制对象 {i+1}: {label} at [{x1}, {y1}, {x2}, {y2}]\n")
+        
+        if log_lines:
+            sys.stdout.write("".join(log_lines))
         
+        if return_records:
+            return annotated_image, records
         return annotated_image
     
     def save_result(self, image: np.ndarray, output_path: str) -> bool:
@@ -172,10 +374,22 @@ class DetectionVisualizer:
         """
         try:
             # 确保输出目录存在
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            output_dir = os.path.dirname(output_path)
+            if output_dir and output_dir not in self._ensured_dirs:
+                os.makedirs(output_dir, exist_ok=True)
+                self._ensured_dirs.add(output_dir)
             
             # 保存图片
-            success = cv2.imwrite(output_path, image)
+            is_jpeg = os.path.splitext(output_path)[1].lower() in _JPEG_EXTENSIONS
+            if (is_jpeg and _TURBO_JPEG is not None
+                    and image.dtype == np.uint8 and image.ndim == 3 and image.shape[2] == 3):
+                Path(output_path).write_bytes(_TURBO_JPEG.encode(np.ascontiguousarray(image),
+                                                                 quality=self.JPEG_QUALITY,
+                                                                 pixel_format=TJPF_BGR,
+                                                                 jpeg_subsample=TJSAMP_420))
+                success = True
+            else:
+                success = cv2.imwrite(output_path, image, [cv2.IMWRITE_JPEG_QUALITY, self.JPEG_QUALITY])
             if success:
                 print(f"成功保存标注图片到: {output_path}")
                 return True
@@ -186,51 +400,55 @@ class DetectionVisualizer:
             print(f"错误：保存图片时发生异常 - {e}")
             return False
     
-    def create_summary_text(self, detections: List[Dict[str, Any]], output_dir: str):
+    def create_summary_text(self, detections: List[Dict[str, Any]], output_dir: str,
+                            records: Optional[List[Tuple[int, Any, Optional[list]]]] = None):
         """
         创建检测结果汇总文本文件
         
         Args:
             detections: 检测结果列表
             output_dir: 输出目录
+            records: draw_bounding_boxes返回的记录列表，None则从检测结果重新读取
         """
         summary_path = os.path.join(output_dir, "detection_summary.txt")
+        if records is None:
+            records = self._summary_records(detections)
         
         try:
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                f.write("检测结果汇总\n")
-                f.write("=" * 50 + "\n\n")
-                f.write(f"总计检测到 {len(detections)} 个对象:\n\n")
-                
-                for i, detection in enumerate(detections):
-                    bbox = detection.get('bbox_2d', [])
-                    label = detection.get('label', 'Unknown')
-                    
-                    f.write(f"{i+1:2d}. {label}\n")
-                    if len(bbox) == 4:
-                        x1, y1, x2, y2 = bbox
-                        width = x2 - x1
-                        height = y2 - y1
-                        f.write(f"    位置: ({x1}, {y1}) - ({x2}, {y2})\n")
-                        f.write(f"    尺寸: {width} x {height} 像素\n")
-                    f.write("\n")                
-                # 统计各类别数量
-                label_counts = {}
-                for detection in detections:
-                    label = detection.get('label', 'Unknown')
-                    label_counts[label] = label_counts.get(label, 0) + 1
-                
-                f.write("各类别统计:\n")
-                f.write("-" * 30 + "\n")
-                for label, count in sorted(label_counts.items()):
-                    f.write(f"{label}: {count} 个\n")
+            lines = [
+                "检测结果汇总\n",
+                "=" * 50 + "\n\n",
+                f"总计检测到 {len(detections)} 个对象:\n\n",
+            ]
+            
+            # 逐条生成汇总文本的同时统计各类别数量
+            label_counts = Counter()
+            for index, label, bbox in records:
+                label_counts[label] += 1
+                lines.append(f"{index:2d}. {label}\n")
+                if bbox is not None:
+                    x1, y1, x2, y2 = bbox
+                    width = x2 - x1
+                    height = y2 - y1
+                    lines.append(f"    位置: ({x1}, {y1}) - ({x2}, {y2})\n")
+                    lines.append(f"    尺寸: {width} x {height} 像素\n")
+                lines.append("\n")
+            
+            lines.append("各类别统计:\n")
+            lines.append("-" * 30 + "\n")
+            for label, count in sorted(label_counts.items()):
+                lines.append(f"{label}: {count} 个\n")
+            
+            # 拼接后一次性写入
+            Path(summary_path).write_bytes("".join(lines).encode("utf-8"))
             
             print(f"成功创建检测结果汇总: {summary_path}")
             
         except Exception as e:
             print(f"错误：创建汇总文件时发生异常 - {e}")
     
-    def visualize(self, json_path: str, image_path: str, output_dir: Optional[str] = None) -> bool:
+    def visualize(self, json_path: str, image_path: str, output_dir: Optional[str] = None,
+                  reduce: int = 1) -> bool:
         """
         完整的可视化流程
         
@@ -238,36 +456,48 @@ class DetectionVisualizer:
             json_path: 检测结果JSON文件路径
             image_path: 原始图片路径
             output_dir: 输出目录，如果为None则使用JSON文件所在目录
+            reduce: 图片解码时的缩小倍数（1、2、4、8），大图只需预览标注时可减少解码开销
             
         Returns:
             是否成功完成可视化
         """
-        # 如果没有指定输出目录，使用JSON文件所在目录
-        if output_dir is None:
-            output_dir = os.path.dirname(json_path)
+        return self.visualize_job(VisualizeJob.create(json_path, image_path, output_dir), reduce)
+    
+    def visualize_job(self, job: VisualizeJob, reduce: int = 1) -> bool:
+        """
+        执行一个可视化任务的完整流程
         
-        print(f"开始可视化处理...")
-        print(f"检测结果文件: {json_path}")
-        print(f"原始图片: {image_path}")
-        print(f"输出目录: {output_dir}")
-        print("-" * 50)
+        Args:
+            job: 可视化任务
+            reduce: 图片解码时的缩小倍数（1、2、4、8）
+            
+        Returns:
+            是否成功完成可视化
+        """
+        print("\n".join([
+            "开始可视化处理...",
+            f"检测结果文件: {job.json_path}",
+            f"原始图片: {job.image_path}",
+            f"输出目录: {job.output_dir}",
+            "-" * 50,
+        ]))
         
         # 加载检测结果
-        detections = self.load_detection_results(json_path)
+        detections = self.load_detection_results(job.json_path)
         if not detections:
             return False
         
         # 加载图片
-        image = self.load_image(image_path)
+        image = self.load_image(job.image_path, reduce)
         if image is None:
             return False
         
-        # 绘制标注
-        annotated_image = self.draw_bounding_boxes(image, detections)
+        # 绘制标注（图片仅在此处使用，直接在其上绘制以省去一次整图复制）
+        annotated_image, records = self.draw_bounding_boxes(image, detections, inplace=True, verbose=False,
+                                                            return_records=True, scale=1.0 / reduce)
         
         # 生成输出文件名
-        image_name = Path(image_path).stem
-        output_image_path = os.path.join(output_dir, f"{image_name}_annotated.jpg")
+        output_image_path = os.path.join(job.output_dir, f"{job.stem}_annotated.jpg")
         
         # 保存标注图片
         success = self.save_result(annotated_image, output_image_path)
@@ -275,10 +505,9 @@ class DetectionVisualizer:
             return False
         
         # 创建汇总文件
-        self.create_summary_text(detections, output_dir)
+        self.create_summary_text(detections, job.output_dir, records)
         
-        print("-" * 50)
-        print("可视化完成！")
+        print("-" * 50 + "\n可视化完成！")
         return True
 
 
@@ -305,12 +534,12 @@ class VisualizationManager:
         if image_path is None:
             image_path = "InputPicture/test.png"
         
-        # 检查文件
-        if not os.path.exists(json_path):
+        # 检查文件（目录等非普通文件同样视为不存在）
+        if not _is_regular_file(json_path):
             print(f"❌ 检测结果文件不存在: {json_path}")
             return False
         
-        if not os.path.exists(image_path):
+        if not _is_regular_file(image_path):
             print(f"❌ 原始图片文件不存在: {image_path}")
             return False
         
@@ -318,16 +547,17 @@ class VisualizationManager:
         
         # 执行可视化
         try:
-            success = self.visualizer.visualize(json_path, image_path)
+            job = VisualizeJob.create(json_path, image_path)
+            success = self.visualizer.visualize_job(job)
             
             if success:
-                print("\n🎉 可视化完成！")
-                output_dir = os.path.dirname(json_path)
-                print(f"📁 输出目录: {output_dir}")
-                print("📄 生成的文件:")
-                image_name = Path(image_path).stem
-                print(f"   - {image_name}_annotated.jpg (标注图片)")
-                print("   - detection_summary.txt (检测汇总)")
+                print("\n".join([
+                    "\n🎉 可视化完成！",
+                    f"📁 输出目录: {job.output_dir}",
+                    "📄 生成的文件:",
+                    f"   - {job.stem}_annotated.jpg (标注图片)",
+                    "   - detection_summary.txt (检测汇总)",
+                ]))
                 return True
             else:
                 print("\n❌ 可视化失败")
@@ -340,15 +570,55 @@ class VisualizationManager:
         except Exception as e:
             print(f"\n❌ 处理过程中发生错误: {e}")
             return False
+    
+    def batch_visualize(self, pairs: Sequence[Tuple[str, str]], workers: Optional[int] = None) -> List[bool]:
+        """
+        批量可视化多组检测结果
+        
+        OpenCV在图片读写和绘制时会释放GIL，使用线程池即可让多张图片的解码、绘制和编码重叠进行，
+        且无需在进程间传递图片数据
+        
+        结果输出到各JSON文件所在目录，每个目录都会写入detection_summary.txt，
+        因此各组的JSON文件必须位于不同目录
+        
+        Args:
+            pairs: (JSON文件路径, 图片路径) 列表
+            workers: 线程数，None则使用CPU核心数
+            
+        Returns:
+            每组是否成功，顺序与输入一致
+            
+        Raises:
+            ValueError: 当多组结果的输出目录相同时
+        """
+        if not pairs:
+            return []
+        
+        # 同一目录下的并发任务会同时写入同一个汇总文件，结果不确定，提前拒绝
+        output_dirs = Counter(os.path.realpath(os.path.dirname(json_path)) for json_path, _ in pairs)
+        duplicates = sorted(path for path, count in output_dirs.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"多组检测结果的输出目录相同，汇总文件会互相覆盖: {duplicates}")
+        
+        workers = min(workers or os.cpu_count() or 1, len(pairs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda pair: self.quick_visualize(*pair), pairs))
 
 
 # 便捷函数
+@functools.lru_cache(maxsize=None)
+def _default_manager() -> VisualizationManager:
+    """获取共享的可视化管理器（首次使用时创建，之后的便捷函数调用复用同一实例）"""
+    return VisualizationManager()
+
 def quick_visualize(json_path: str = None, image_path: str = None) -> bool:
     """便捷函数：快速可视化"""
-    manager = VisualizationManager()
-    return manager.quick_visualize(json_path, image_path)
+    return _default_manager().quick_visualize(json_path, image_path)
+
+def batch_visualize(pairs: Sequence[Tuple[str, str]], workers: Optional[int] = None) -> List[bool]:
+    """便捷函数：批量可视化"""
+    return _default_manager().batch_visualize(pairs, workers)
 
 def visualize_detection_results(json_path: str, image_path: str, output_dir: str = None) -> bool:
     """便捷函数：可视化检测结果"""
-    visualizer = DetectionVisualizer()
-    return visualizer.visualize(json_path, image_path, output_dir)
+    return _default_manager().visualizer.visualize(json_path, image_path, output_dir)
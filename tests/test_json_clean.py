@@ -0,0 +1,37 @@
+"""
+clean_json_from_markdown 测试
+"""
+
+import unittest
+
+from Utiles.JsonClean import clean_json_from_markdown
+
+
+class CleanJsonFromMarkdownTest(unittest.TestCase):
+    
+    def test_json_fence(self):
+        self.assertEqual(clean_json_from_markdown('```json\n[{"a": 1}]\n```'), '[{"a": 1}]')
+    
+    def test_plain_fence(self):
+        self.assertEqual(clean_json_from_markdown('```\n{"a": 1}\n```'), '{"a": 1}')
+    
+    def test_single_line_fence(self):
+        self.assertEqual(clean_json_from_markdown('```[1, 2]```'), '[1, 2]')
+    
+    def test_missing_closing_fence(self):
+        self.assertEqual(clean_json_from_markdown('```json\n{"a": 1}\n'), '{"a": 1}')
+    
+    def test_no_fence(self):
+        self.assertEqual(clean_json_from_markdown('  {"a": 1}  '), '{"a": 1}')
+    
+    def test_backticks_inside_json_string(self):
+        # JSON字符串中的```不是结束标记，不能截断内容
+        self.assertEqual(clean_json_from_markdown('```json\n"a```b"\n```'), '"a```b"')
+        self.assertEqual(clean_json_from_markdown('```json\n{"code": "```py"}\n```'), '{"code": "```py"}')
+    
+    def test_text_after_closing_fence(self):
+        self.assertEqual(clean_json_from_markdown('```json\n[1]\n```\n以上是结果'), '[1]')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+"""
+validate_bbox_results 测试
+"""
+
+import unittest
+
+from Utiles.JsonExtract import validate_bbox_results
+
+
+class ValidateBboxResultsTest(unittest.TestCase):
+    
+    def test_orders_corners_and_truncates(self):
+        results = validate_bbox_results([{"bbox_2d": [30.7, 40.2, 10.9, 20.5], "label": "cup"}])
+        self.assertEqual(results, [{"bbox_2d": [10, 20, 30, 40], "label": "cup"}])
+    
+    def test_large_coordinates_do_not_wrap(self):
+        # 超出int32范围的坐标不能溢出成负数或小数值
+        results = validate_bbox_results([{"bbox_2d": [5e9, 2, -3e9, 1]}])
+        self.assertEqual(results[0]["bbox_2d"], [-3000000000, 1, 5000000000, 2])
+    
+    def test_skips_invalid_entries(self):
+        results = validate_bbox_results([1, {"bbox_2d": [1, 2]}, {"bbox_2d": [1, "a", 3, 4]}, {"bbox_2d": [0, 0, 1, 1]}])
+        self.assertEqual(results, [{"bbox_2d": [0, 0, 1, 1]}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""
+ResultSaver 运行序号测试
+"""
+
+import os
+import tempfile
+import unittest
+
+from Utiles.ResultSaver import ResultSaver, RUN_COUNTER_FILE
+
+
+class RunNumberTest(unittest.TestCase):
+    
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output_dir = self._tmp.name
+        self.saver = ResultSaver(self.output_dir)
+    
+    def tearDown(self):
+        self._tmp.cleanup()
+    
+    def test_sequential_numbers(self):
+        self.assertEqual([self.saver.get_next_run_number() for _ in range(3)], [0, 1, 2])
+    
+    def test_skips_existing_runs(self):
+        os.makedirs(os.path.join(self.output_dir, "000Run"))
+        open(os.path.join(self.output_dir, "001Run.zip"), "wb").close()
+        self.assertEqual(self.saver.get_next_run_number(), 2)
+    
+    def test_stale_counter_does_not_reuse_existing_run(self):
+        self.saver.get_next_run_number()
+        os.makedirs(os.path.join(self.output_dir, "005Run"))
+        with open(os.path.join(self.output_dir, RUN_COUNTER_FILE), "w") as f:
+            f.write("5")
+        self.assertEqual(self.saver.get_next_run_number(), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()